@@ -4,3 +4,6 @@ This script defines all constants used in the project.
 """
 
 CSV_SEP = ","
+FAST_IO = True  # read .csv files with pyarrow if it is installed
+MAX_POINTS = 50_000  # larger tables are randomly subsampled before plotting
+VOXEL_BINS = 0  # if > 0, larger tables with numeric axes are aggregated into VOXEL_BINS^3 voxels instead
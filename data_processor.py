@@ -5,81 +5,294 @@ This script holds functions for data processing.
 
 # IMPORTS
 
-import plotly.graph_objects as go
-import plotly.express as px
+import functools
+import config
 import numpy as np
 import pandas as pd
-from dash import Dash, dcc, html, Input, Output
+from typing import TYPE_CHECKING
+
+# plotly and dash are imported inside the functions that need them, the terminal dialogs start without them
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+    from dash import Dash
+
+# CACHES
+
+# prepared plotting columns, keyed by (id(df), col_name); cleared whenever a new Dash app is built
+_prep_cache: dict[tuple[int, str], np.ndarray] = {}
+# axis columns as extracted by _axis_values, keyed and cleared the same way
+_axis_cache: dict[tuple[int, str], np.ndarray] = {}
 
 # GENERAL FUNCTIONS
 
+@functools.lru_cache(maxsize=None)
 def identify_files_in_base_folder() -> list:
     """
     Identify all files in the base folder of the script that have the file endings .xlsx and .csv and return a list of found file names.
+    The folder is only scanned once per session.
     """
     import os
     base_folder = os.path.dirname(os.path.abspath(__file__))
     files = [f for f in os.listdir(base_folder) if os.path.isfile(os.path.join(base_folder, f)) and not f.startswith('.') and f.endswith(('.xlsx', '.csv'))]
     return files
 
-def choose_file_by_terminal(files: list) -> None:
+def _ask_for_choice(options: list, prompt: str, confirmation: str):
     """
-    Give the user the option to choose a file by entering the corresponding number in the terminal. Returns the selected file name.
+    Ask the user in the terminal for the number of one of the given options until a valid number is entered. Returns the chosen option.
     """
-    print("Found files: ")
-    i = 1
-    for f in files:
-        print(f"({i}) - {f}")
-        i += 1
-    print("\nPlease choose a file by entering the corresponding number (e.g., 1):")
     while True:
         try:
-            choice = int(input("Your choice: "))
-            if 1 <= choice <= len(files):
-                selected_file = files[choice - 1]
-                print(f"You selected: {selected_file}")
-                return selected_file
+            choice = int(input(prompt))
+            if 1 <= choice <= len(options):
+                selected = options[choice - 1]
+                print(f"{confirmation}: {selected}")
+                return selected
             else:
-                print(f"Please enter a number between 1 and {len(files)}.")
+                print(f"Please enter a number between 1 and {len(options)}.")
         except ValueError:
             print("Invalid input. Please enter a valid number.")
 
-def choose_sheet_by_terminal(file_name: str) -> str:
+def choose_file_by_terminal(files: list) -> str:
+    """
+    Give the user the option to choose a file by entering the corresponding number in the terminal. Returns the selected file name.
+    """
+    print("Found files: ")
+    # one write for the whole list instead of one per file
+    print("\n".join(f"({i}) - {f}" for i, f in enumerate(files, start=1)))
+    print("\nPlease choose a file by entering the corresponding number (e.g., 1):")
+    return _ask_for_choice(files, "Your choice: ", "You selected")
+
+def choose_sheet_by_terminal(xls: pd.ExcelFile) -> str:
     """
-    If the given file is an excel file, give the user the option to choose a sheet by entering the corresponding number in the terminal.
+    Give the user the option to choose a sheet of the opened excel file by entering the corresponding number in the terminal.
     """
 
-    xls = pd.ExcelFile(file_name)
     sheets = xls.sheet_names
     # if only one sheet available, automatically return it
     if len(sheets) == 1:
         return sheets[0]
     print("\nAvailable sheets in the Excel file:")
-    for i, sheet in enumerate(sheets, start=1):
-        print(f"({i}) - {sheet}")
+    print("\n".join(f"({i}) - {sheet}" for i, sheet in enumerate(sheets, start=1)))
 
     print("\nPlease choose a sheet by entering the corresponding number (e.g., 1):")
-    while True:
+    return _ask_for_choice(sheets, "Your choice: ", "You selected")
+
+def _excel_engine() -> str:
+    """
+    Return the engine to read .xlsx files with: the Rust based calamine reader if it is installed, openpyxl otherwise.
+    """
+    import importlib.util
+    return "calamine" if importlib.util.find_spec("python_calamine") else "openpyxl"
+
+def _read_sidecar_cache(file_name: str, cache_name: str, reader: str | None = None) -> pd.DataFrame | None:
+    """
+    Return the DataFrame stored in the sidecar file cache_name (.parquet or .feather) if it is newer than file_name, otherwise None.
+    For a .feather file, reader describes the settings the source is parsed with; a file written with other settings is not used.
+    """
+    import os
+    if not os.path.exists(cache_name) or os.path.getmtime(cache_name) <= os.path.getmtime(file_name):
+        return None
+    try:
+        if cache_name.endswith('.feather'):
+            import pyarrow as pa
+            # the Arrow IPC footer holds the schema, so the metadata is checked without loading the table
+            with pa.ipc.open_file(cache_name) as cached:
+                metadata = cached.schema.metadata or {}
+            if metadata.get(b"reader", b"").decode() != (reader or ""):
+                return None
+            return pd.read_feather(cache_name)
+        return pd.read_parquet(cache_name)
+    except (ImportError, OSError, ValueError):
+        return None
+
+def _write_sidecar_cache(df: pd.DataFrame, cache_name: str, reader: str | None = None) -> None:
+    """
+    Store the DataFrame in the sidecar file cache_name (.parquet or .feather). Tables the format cannot represent (e.g. columns of mixed types) are skipped.
+    For a .feather file, reader is stored in its metadata and checked by _read_sidecar_cache.
+    """
+    try:
+        if cache_name.endswith('.feather'):
+            import pyarrow as pa
+            import pyarrow.feather
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            table = table.replace_schema_metadata({**(table.schema.metadata or {}), b"reader": (reader or "").encode()})
+            pyarrow.feather.write_feather(table, cache_name, compression="lz4")
+        else:
+            df.to_parquet(cache_name)
+    except (ImportError, OSError, ValueError, TypeError, NotImplementedError):
+        pass
+
+def _read_csv_schema(file_name: str) -> dict | None:
+    """
+    Return the column dtypes stored for file_name by _write_csv_schema, or None if there are none.
+    """
+    import json
+    try:
+        with open(f"{file_name}.schema.json", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_csv_schema(file_name: str, df: pd.DataFrame) -> None:
+    """
+    Store the dtypes inferred for the columns of file_name in a JSON file next to it, so that later reads can skip the type inference.
+    Only numeric, boolean and text columns get a stored dtype, all others (e.g. timestamps) are stored as None and inferred again.
+    If the file has no missing values at all, later reads may also skip the missing value detection (see _schema_na_filter).
+    """
+    import json
+    dtypes = {}
+    for col in df.columns:
+        dtype = df[col].dtype
+        if dtype.kind in 'iufb':
+            dtypes[col] = dtype.name
+        elif pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+            dtypes[col] = "str"  # object columns of e.g. dates would come back as text otherwise
+        else:
+            dtypes[col] = None
+    schema = {"dtypes": dtypes, "na_filter": bool(df.isna().any().any())}
+    try:
+        with open(f"{file_name}.schema.json", "w", encoding="utf-8") as f:
+            json.dump(schema, f)
+    except OSError:
+        pass
+
+def _schema_na_filter(schema: dict) -> bool:
+    """
+    Return whether a read with the schema has to detect missing values. Skipping it is only safe if every column has a stored
+    numeric or boolean dtype: an empty or "NA" field then fails to parse and the dtypes are inferred again, whereas a text
+    column would silently keep it as a string.
+    """
+    return schema["na_filter"] or any(dtype is None or dtype == "str" for dtype in schema["dtypes"].values())
+
+def _csv_parser_options(sep: str) -> dict:
+    """
+    Return the pd.read_csv options for parsing a .csv file with the given separator.
+    """
+    # the C parser reads straight from the memory mapped file instead of copying it into Python buffers first.
+    # It only handles single character separators (and whitespace), longer ones are matched literally by the Python parser.
+    if len(sep) == 1 or sep == r"\s+":
+        return dict(sep=sep, engine="c", memory_map=True, low_memory=False)
+    import re
+    return dict(sep=re.escape(sep), engine="python", memory_map=True)
+
+def _read_csv_with_pyarrow(file_name: str, sep: str, schema: dict | None) -> pd.DataFrame | None:
+    """
+    Parse a .csv file with pyarrow's multithreaded reader into the same dtypes pd.read_csv would give.
+    Returns None if pyarrow is not installed or the file has to be left to pandas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.csv as pac
+    except ImportError:
+        return None
+    # the missing value markers and boolean spellings of pd.read_csv, empty text fields become NaN as well
+    convert_args = dict(
+        null_values=[
+            "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+            "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"
+        ],
+        strings_can_be_null=True,
+        true_values=["True", "TRUE", "true"],
+        false_values=["False", "FALSE", "false"]
+    )
+    column_types = {}
+    if schema is not None:
+        column_types = {
+            col: pa.string() if dtype == "str" else pa.from_numpy_dtype(np.dtype(dtype))
+            for col, dtype in schema["dtypes"].items() if dtype is not None
+        }
+        if not _schema_na_filter(schema):
+            convert_args["null_values"] = []
+
+    def read(column_types: dict):
+        return pac.read_csv(
+            file_name,
+            read_options=pac.ReadOptions(use_threads=True, block_size=1 << 20),
+            parse_options=pac.ParseOptions(delimiter=sep, newlines_in_values=True),
+            convert_options=pac.ConvertOptions(column_types=column_types, **convert_args)
+        )
+
+    try:
+        table = read(column_types)
+        # duplicate and empty column names are left to pandas, which renames them (a.1, Unnamed: 0)
+        names = table.column_names
+        if "" in names or len(set(names)) < len(names):
+            return None
+        # pandas keeps dates, times and timestamps as text, so those columns are read again as strings
+        temporal = {field.name: pa.string() for field in table.schema if pa.types.is_temporal(field.type)}
+        if temporal:
+            table = read({**column_types, **temporal})
+    except pa.ArrowInvalid:
+        return None  # e.g. rows with a missing field, which pandas fills with NaN
+    for i, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))  # empty columns are float NaN in pandas
+        elif pa.types.is_floating(field.type) and (pc.max(pc.abs(table.column(i))).as_py() or 0) >= 2**63:
+            return None  # integers beyond int64 become doubles here, pandas keeps them exact
+    # columns are decoded in parallel, the pandas conversion reuses the Arrow buffers where it can
+    return table.to_pandas(split_blocks=True, self_destruct=True, use_threads=True)
+
+def _read_csv(file_name: str, sep: str, schema: dict | None) -> pd.DataFrame:
+    """
+    Parse a .csv file with pyarrow (if config.FAST_IO is set and pyarrow is installed) or a parser of pandas.
+    A schema from _read_csv_schema fixes the dtypes of the columns.
+    """
+    if config.FAST_IO and len(sep) == 1:
+        df = _read_csv_with_pyarrow(file_name, sep, schema)
+        if df is not None:
+            return df
+    parser_options = _csv_parser_options(sep)
+    if schema is None:
+        return pd.read_csv(file_name, **parser_options)
+    dtypes = {col: dtype for col, dtype in schema["dtypes"].items() if dtype is not None}
+    return pd.read_csv(
+        file_name, **parser_options,
+        dtype=dtypes, na_filter=_schema_na_filter(schema)
+    )
+
+def open_csv_to_df(file_name: str, sep: str) -> pd.DataFrame:
+    """
+    Read a .csv file into a pandas DataFrame. The dtypes inferred on the first read are stored next to the file
+    and passed to the parser on later reads, as long as the file still has the same columns.
+    """
+    schema = _read_csv_schema(file_name)
+    # the header is read with the same pandas options as the whole file, so renamed duplicate/empty names compare equal
+    if schema is not None and pd.read_csv(file_name, nrows=0, **_csv_parser_options(sep)).columns.tolist() != list(schema["dtypes"]):
+        schema = None
+    if schema is not None:
         try:
-            choice = int(input("Your choice: "))
-            if 1 <= choice <= len(sheets):
-                selected_sheet = sheets[choice - 1]
-                print(f"You selected: {selected_sheet}")
-                return selected_sheet
-            else:
-                print(f"Please enter a number between 1 and {len(sheets)}.")
-        except ValueError:
-            print("Invalid input. Please enter a valid number.")
+            return _read_csv(file_name, sep, schema)
+        except (ValueError, TypeError, KeyError, OverflowError):
+            pass  # the file no longer matches the stored schema, infer the dtypes again
+    df = _read_csv(file_name, sep, None)
+    _write_csv_schema(file_name, df)
+    return df
 
 def open_file_to_df(file_name: str) -> pd.DataFrame:
     """
     Open a given file (either .xlsx or .csv) and return a pandas DataFrame of the found table.
+    Excel sheets are cached in a Parquet file and .csv files in a Feather file next to the source, so later runs skip parsing them.
     """
     if file_name.endswith('.xlsx'):
-        selected_sheet = choose_sheet_by_terminal(file_name)
-        return pd.read_excel(file_name, sheet_name=selected_sheet)
+        # the workbook is opened once, for listing its sheets as well as for reading the chosen one
+        with pd.ExcelFile(file_name, engine=_excel_engine()) as xls:
+            selected_sheet = choose_sheet_by_terminal(xls)
+            cache_name = f"{file_name}.{selected_sheet}.parquet"
+            df = _read_sidecar_cache(file_name, cache_name)
+            if df is None:
+                df = pd.read_excel(xls, sheet_name=selected_sheet)
+                _write_sidecar_cache(df, cache_name)
+        return df
     elif file_name.endswith('.csv'):
-        return pd.read_csv(file_name)
+        cache_name = f"{file_name}.feather"
+        # a sidecar parsed with another separator or reader would return the wrong columns
+        reader = f"sep={config.CSV_SEP!r}, fast_io={config.FAST_IO}"
+        df = _read_sidecar_cache(file_name, cache_name, reader)
+        if df is None:
+            df = open_csv_to_df(file_name, config.CSV_SEP)
+            _write_sidecar_cache(df, cache_name, reader)
+        return df
     else:
         raise ValueError("Unsupported file format. Please provide a .xlsx or .csv file.")
 
@@ -89,22 +302,11 @@ def choose_columns_by_terminal(df: pd.DataFrame) -> tuple:
     """
     columns = df.columns
     print("\nAvailable columns in the data frame:")
-    for i, col in enumerate(columns, start =1):
-        print(f"({i}) - {col}")
+    print("\n".join(f"({i}) - {col}" for i, col in enumerate(columns, start=1)))
 
     def _ask_for(column_role: str) -> str:
         prompt = f"\nPlease choose the {column_role} column by entering the corresponding number (e.g., 1): "
-        while True:
-            try:
-                choice = int(input(prompt))
-                if 1 <= choice <= len(columns):
-                    selected = columns[choice - 1]
-                    print(f"You selected for {column_role}: {selected}")
-                    return selected
-                else:
-                    print(f"Please enter a number between 1 and {len(columns)}.")
-            except ValueError:
-                print("Invalid input. Please enter a valid number.")
+        return _ask_for_choice(columns, prompt, f"You selected for {column_role}")
     
     x_col = _ask_for("X-Axis")
     y_col = _ask_for("Y-Axis")
@@ -119,8 +321,7 @@ def change_ordinal_cols_by_terminal(df: pd.DataFrame) -> pd.DataFrame:
     """
     columns = df.columns
     print("\nAvailable columns in the data frame:")
-    for i, col in enumerate(columns, start=1):
-        print(f"({i}) - {col} (dtype: {df[col].dtype})")
+    print("\n".join(f"({i}) - {col} (dtype: {df[col].dtype})" for i, col in enumerate(columns, start=1)))
 
     print("\nFor each column, enter 't' to keep as text or 'n' to convert to numeric (integer/float).")
     
@@ -145,46 +346,220 @@ def change_ordinal_cols_by_terminal(df: pd.DataFrame) -> pd.DataFrame:
     
     return df
 
+def convert_text_cols_to_category(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert text columns with few distinct values to the pandas category dtype, so that their codes can be reused instead of being recomputed for every plot.
+    """
+    max_categories = max(256, len(df) // 2)
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique(dropna=False) < max_categories:
+            df[col] = df[col].astype('category')
+    return df
+
+def downcast_numeric_cols(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast float columns to float32 and integer columns to the smallest integer type that holds their values, which halves the data moved into the plots.
+    """
+    for col in df.select_dtypes(include='float').columns:
+        df[col] = pd.to_numeric(df[col], downcast='float')
+    for col in df.select_dtypes(include='integer').columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+
 def change_data_types_to_numeric(df: pd.DataFrame, col_name: str):
     """
     Prepare column data for plotting by handling different data types.
+    Results are cached per DataFrame and column, so each column is only converted once per session.
+    """
+    key = (id(df), col_name)
+    if key not in _prep_cache:
+        _prep_cache[key] = _convert_column_to_numeric(df, col_name)
+    return _prep_cache[key]
+
+def _smallest_int_dtype(max_value: int) -> type:
+    """
+    Return the narrowest signed NumPy integer type that can hold all values from 0 up to max_value.
+    """
+    for dtype in (np.int8, np.int16, np.int32):
+        if max_value <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+def _narrow_float(values) -> np.ndarray:
+    """
+    Return the values as a contiguous float32 array if that keeps them within the tolerance pd.to_numeric(downcast='float')
+    allows (as in downcast_numeric_cols), otherwise as float64, so large integers and timestamps are shown unrounded.
+    """
+    return np.ascontiguousarray(pd.to_numeric(np.asarray(values, dtype=np.float64), downcast='float'))
+
+def _convert_column_to_numeric(df: pd.DataFrame, col_name: str) -> np.ndarray:
+    """
+    Uncached worker of change_data_types_to_numeric. Returns a contiguous float32 array where that is lossless
+    and a float64 array otherwise, which plotly can ship to the browser as a compact typed array.
     """
     if col_name not in df.columns:
-        return df.iloc[:, 0]  # Fallback to first column
+        return _convert_column_to_numeric(df, df.columns[0])  # Fallback to first column
     
-    col_data = df[col_name].copy()
+    col_data = df[col_name]
     
     # Handle timedelta columns by converting to total seconds
     if pd.api.types.is_timedelta64_dtype(col_data):
-        return col_data.dt.total_seconds()
+        result = col_data.dt.total_seconds()
     
     # Handle datetime columns by converting to timestamp (seconds)
     elif pd.api.types.is_datetime64_any_dtype(col_data):
-        # Convert NaT to NaN-safe numeric
-        ts = col_data.view('int64')  # nanoseconds
-        ts = pd.Series(ts).where(~col_data.isna(), np.nan)
-        return (ts // 10**9).astype(float)
+        # Seconds since epoch on the raw datetime64 array in the column's own unit, so dates outside 1677-2262
+        # do not overflow a nanosecond cast. Time zone aware columns are taken as UTC, NaT becomes NaN.
+        if isinstance(col_data.dtype, pd.DatetimeTZDtype):
+            col_data = col_data.dt.tz_convert(None)
+        ts = col_data.to_numpy()
+        result = (ts - np.datetime64(0, 's')) / np.timedelta64(1, 's')
     
     # Handle categorical/string columns by creating numeric codes
-    elif col_data.dtype == 'object':
-        col_data = col_data.fillna('Unknown')
-        return pd.Categorical(col_data).codes.astype(float)
+    elif pd.api.types.is_string_dtype(col_data.dtype):
+        result, _ = pd.factorize(col_data.fillna('Unknown'), sort=False)
     
     # Numeric: fill NaN
-    return col_data.astype(float).fillna(0.0)
+    else:
+        result = col_data.astype(float).fillna(0.0)
+
+    return _narrow_float(result)
+
+def _categorical_with_unknown(col_data: pd.Series) -> pd.Categorical:
+    """
+    Return the column as a pandas Categorical without unused categories, in which missing values are labelled "Unknown".
+    """
+    if not isinstance(col_data.dtype, pd.CategoricalDtype):
+        return pd.Categorical(col_data.fillna("Unknown"))
+    cats = col_data.array.remove_unused_categories()
+    if cats.isna().any():
+        if "Unknown" not in cats.categories:
+            cats = cats.add_categories("Unknown")
+        cats = cats.fillna("Unknown")
+    return cats
 
-def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_col: str) -> go.Figure:
+def _axis_values(df: pd.DataFrame, col_name: str) -> np.ndarray:
+    """
+    Return the values of an axis column as a NumPy array. Numeric columns become contiguous float arrays (float32 if lossless),
+    all other columns are passed on unchanged so that plotly keeps rendering them as category/date axes.
+    Each column is only extracted once per DataFrame.
+    """
+    key = (id(df), col_name)
+    if key not in _axis_cache:
+        col_data = df[col_name]
+        if pd.api.types.is_numeric_dtype(col_data) and not pd.api.types.is_bool_dtype(col_data):
+            values = _narrow_float(col_data.to_numpy(dtype=np.float64, copy=False, na_value=np.nan))
+        else:
+            values = col_data.to_numpy()
+        _axis_cache[key] = values
+    return _axis_cache[key]
+
+@functools.lru_cache(maxsize=None)
+def _sample_row_indices(n_rows: int, max_points: int) -> np.ndarray:
+    """
+    Return a sorted, reproducible random subset of max_points row indices out of n_rows.
+    """
+    rng = np.random.default_rng(0)
+    rows = np.sort(rng.choice(n_rows, size=max_points, replace=False)).astype(np.int32)
+    rows.flags.writeable = False  # shared between calls through the cache
+    return rows
+
+def _stratified_sample(groups: dict, n_rows: int, max_points: int) -> dict:
+    """
+    Reduce the row positions of every group to a reproducible random share of max_points proportional to the group size.
+    Every group keeps at least one row, so rare categories stay visible.
+    """
+    rng = np.random.default_rng(0)
+    sampled = {}
+    for key, idx in groups.items():
+        size = max(1, round(max_points * len(idx) / n_rows))
+        sampled[key] = np.sort(rng.choice(idx, size=size, replace=False)) if size < len(idx) else idx
+    return sampled
+
+def import_plotting_modules() -> None:
+    """
+    Import plotly and dash, so that they are already loaded when build_3d_figure and build_dash_app need them.
+    Meant to run in a background thread while the terminal dialogs wait for user input.
+    """
+    import plotly.graph_objects
+    import dash
+
+def _voxel_ids(x_data: np.ndarray, y_data: np.ndarray, z_data: np.ndarray, bins: int) -> np.ndarray:
+    """
+    Return for every point the id of its voxel in a regular grid of bins x bins x bins voxels spanning the data.
+    """
+    voxels = np.zeros(len(x_data), dtype=np.int64)
+    for values in (x_data, y_data, z_data):
+        low, high = np.nanmin(values), np.nanmax(values)
+        scaled = np.nan_to_num((values - low) / ((high - low) or 1.0) * bins)
+        voxels = voxels * bins + np.clip(scaled.astype(np.int64), 0, bins - 1)
+    return voxels
+
+def _duplicate_keys(df: pd.DataFrame, *col_names: str) -> np.ndarray:
+    """
+    Return one key per row which is equal for all rows with identical original values in the given columns.
+    """
+    codes = np.column_stack([pd.factorize(df[col].to_numpy())[0] for col in col_names]).astype(np.int64)
+    return codes.view(np.dtype((np.void, codes.itemsize * codes.shape[1]))).ravel()
+
+def _trace_points(rows, keys: np.ndarray | None, row_idx: np.ndarray, *arrays: np.ndarray) -> tuple:
+    """
+    Select the given rows of the arrays for one trace. Returns the hover customdata, the marker size and the selected arrays.
+    Points sharing a key (a voxel or an identical position) are merged into one at their mean position, its customdata
+    holds the first merged row and the number of merged points, and its marker grows with that number.
+    Without keys, or if no two points share a key, the points are kept as they are and labelled with their row index.
+    """
+    if keys is not None:
+        _, first, inverse, counts = np.unique(keys[rows], return_index=True, return_inverse=True, return_counts=True)
+        if len(counts) < len(inverse):
+            means = ((np.bincount(inverse, weights=values[rows]) / counts).astype(values.dtype) for values in arrays)
+            customdata = np.column_stack((row_idx[rows][first], counts))
+            return (customdata, (3 + np.log2(counts)).astype(np.float32), *means)
+    return (row_idx[rows].reshape(-1, 1), 3, *(values[rows] for values in arrays))
+
+def _hovertemplate(customdata: np.ndarray, x_col: str, y_col: str, z_col: str, color_col: str, color_value: str) -> str:
+    """
+    Return the hover template of a trace, with a line for the number of merged points if the trace has merged points.
+    """
+    merged = "<br>Merged points: %{customdata[1]}" if customdata.shape[1] > 1 else ""
+    return (
+        "Row %{customdata[0]}"
+        f"{merged}"
+        f"<br>{x_col}: %{{x}}"
+        f"<br>{y_col}: %{{y}}"
+        f"<br>{z_col}: %{{z}}"
+        f"<br>{color_col}: {color_value}"
+        "<extra></extra>"
+    )
+
+def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_col: str) -> "go.Figure":
     """
     Build a 3D scatter plot figure for given column selections.
     Supports both continuous (numeric) and discrete (categorical) color coding.
     """
+    import plotly.graph_objects as go
+    from plotly.colors import qualitative
+
+    # Large tables are subsampled, the browser cannot render more than a few ten thousand 3D markers smoothly
+    is_sampled = len(df) > config.MAX_POINTS
+
     # Prepare arrays
-    x_data = df[x_col]
-    y_data = df[y_col]
-    z_data = df[z_col]
+    x_data = _axis_values(df, x_col)
+    y_data = _axis_values(df, y_col)
+    z_data = _axis_values(df, z_col)
     color_data = df[color_col]
+    row_idx = np.arange(len(df), dtype=_smallest_int_dtype(len(df)))
+
+    # With numeric axes, points at identical positions are merged into one marker. With config.VOXEL_BINS set,
+    # large tables are even aggregated into voxels instead of being subsampled.
+    numeric_axes = all(values.dtype.kind == 'f' for values in (x_data, y_data, z_data))
+    voxels = None
+    if is_sampled and config.VOXEL_BINS and numeric_axes:
+        voxels = _voxel_ids(x_data, y_data, z_data, config.VOXEL_BINS)
+        is_sampled = False
 
-    fig = go.Figure()
+    traces = []
+    legend = None
 
     # Determine if color column should be treated as numeric (continuous) or categorical (discrete)
     is_numeric_color = (
@@ -195,25 +570,25 @@ def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_
     )
 
     if is_numeric_color:
-        # Continuous color scale with colorbar
-        row_idx = np.arange(len(df))
-        customdata = np.column_stack((row_idx, color_data))
-        hovertemplate = (
-            "Row %{customdata[0]}"
-            f"<br>{x_col}: %{{x}}"
-            f"<br>{y_col}: %{{y}}"
-            f"<br>{z_col}: %{{z}}"
-            f"<br>{color_col}: %{{customdata[1]}}"
-            "<extra></extra>"
+        # Continuous color scale with colorbar, datetimes/timedeltas are mapped to seconds first.
+        # A uniform random subset is representative for a continuous color scale.
+        rows = _sample_row_indices(len(df), config.MAX_POINTS) if is_sampled else slice(None)
+        color_values = change_data_types_to_numeric(df, color_col)
+        keys = voxels
+        if keys is None and numeric_axes:
+            keys = _duplicate_keys(df, x_col, y_col, z_col, color_col)
+        customdata, marker_size, x_data, y_data, z_data, color_values = _trace_points(
+            rows, keys, row_idx, x_data, y_data, z_data, color_values
         )
-        fig.add_trace(go.Scatter3d(
+        hovertemplate = _hovertemplate(customdata, x_col, y_col, z_col, color_col, "%{marker.color}")
+        traces.append(go.Scatter3d(
             x=x_data,
             y=y_data,
             z=z_data,
             mode="markers",
             marker=dict(
-                size=3,
-                color=color_data,
+                size=marker_size,
+                color=color_values,
                 colorscale="Viridis",
                 colorbar=dict(title=dict(text=color_col)),
                 opacity=0.8
@@ -224,32 +599,36 @@ def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_
         ))
     else:
         # Discrete categories: one trace per category with legend
-        cats = pd.Categorical(color_data.fillna("Unknown"))
+        cats = _categorical_with_unknown(color_data)
         unique_cats = list(cats.categories)
-        palette = getattr(px.colors.qualitative, "Plotly", [
+        palette = getattr(qualitative, "Plotly", [
             "#636EFA", "#EF553B", "#00CC96", "#AB63FA", "#FFA15A",
             "#19D3F3", "#FF6692", "#B6E880", "#FF97FF", "#FECB52"
         ])
         color_map = {cat: palette[i % len(palette)] for i, cat in enumerate(unique_cats)}
 
-        row_idx = np.arange(len(df))
+        # one groupby pass collects the row positions of all categories, instead of one equality scan per category
+        groups = pd.Series(cats).groupby(cats, observed=True).indices
+        # sampling per category keeps the category shares and every rare category visible
+        if is_sampled:
+            groups = _stratified_sample(groups, len(df), config.MAX_POINTS)
+
+        keys = voxels
+        if keys is None and numeric_axes:
+            keys = _duplicate_keys(df, x_col, y_col, z_col)
+
         for cat in unique_cats:
-            mask = (cats == cat)
-            customdata = np.column_stack((row_idx[mask], np.array([cat] * int(mask.sum()))))
-            hovertemplate = (
-                "Row %{customdata[0]}"
-                f"<br>{x_col}: %{{x}}"
-                f"<br>{y_col}: %{{y}}"
-                f"<br>{z_col}: %{{z}}"
-                f"<br>{color_col}: %{{customdata[1]}}"
-                "<extra></extra>"
+            customdata, marker_size, x_values, y_values, z_values = _trace_points(
+                groups[cat], keys, row_idx, x_data, y_data, z_data
             )
-            fig.add_trace(go.Scatter3d(
-                x=x_data[mask],
-                y=y_data[mask],
-                z=z_data[mask],
+            # the category is constant per trace, so it goes into the template instead of the per-point customdata
+            hovertemplate = _hovertemplate(customdata, x_col, y_col, z_col, color_col, cat)
+            traces.append(go.Scatter3d(
+                x=x_values,
+                y=y_values,
+                z=z_values,
                 mode="markers",
-                marker=dict(size=3, color=color_map[cat], opacity=0.8),
+                marker=dict(size=marker_size, color=color_map[cat], opacity=0.8),
                 name=str(cat),
                 customdata=customdata,
                 hovertemplate=hovertemplate,
@@ -257,9 +636,10 @@ def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_
             ))
 
         # Add legend title for categorical color
-        fig.update_layout(legend=dict(title=dict(text=color_col)))
+        legend = dict(title=dict(text=color_col))
 
-    fig.update_layout(
+    # layout and traces are handed over in one go, so plotly only validates the figure once
+    layout = go.Layout(
         title="3D Scatter Plot of Fault Groups - Interactive",
         autosize=False,
         width=1300,
@@ -269,17 +649,31 @@ def build_3d_figure(df: pd.DataFrame, x_col: str, y_col: str, z_col: str, color_
             xaxis_title=x_col,
             yaxis_title=y_col,
             zaxis_title=z_col,
-        )
+        ),
+        legend=legend
     )
-    return fig
+    return go.Figure(data=traces, layout=layout)
 
-def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_start: str, color_coding_start: str) -> Dash:
+def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_start: str, color_coding_start: str) -> "Dash":
     """
     Build and return a Dash app instance.
     """
+    from dash import Dash, dcc, html, Input, Output
+
+    # a new DataFrame invalidates all previously prepared columns
+    _prep_cache.clear()
+    _axis_cache.clear()
+
     # Build Dash app
     app = Dash(__name__)
     all_columns = df.columns.tolist()
+    col_options = [{"label": c, "value": c} for c in all_columns]
+
+    # figures are cached as plain plotly JSON dicts, built once per column selection and shared by the initial
+    # layout and the callback, so toggling back to an earlier selection (including the start one) is free
+    @functools.lru_cache(maxsize=64)
+    def _figure_json(x_col, y_col, z_col, color_col) -> dict:
+        return build_3d_figure(df, x_col, y_col, z_col, color_col).to_plotly_json()
 
     dropdown_style = {"width": "24%", "display": "inline-block", "verticalAlign": "top", "marginRight": "1%"}
     label_style = {"display": "block", "fontWeight": "bold", "marginBottom": "6px"}
@@ -289,7 +683,7 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
             html.Label("Color-Coding", style=label_style),
             dcc.Dropdown(
                 id="color-col",
-                options=[{"label": c, "value": c} for c in all_columns],
+                options=col_options,
                 value=color_coding_start,
                 clearable=False
             )
@@ -298,7 +692,7 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
             html.Label("X-Axis", style=label_style),
             dcc.Dropdown(
                 id="x-col",
-                options=[{"label": c, "value": c} for c in all_columns],
+                options=col_options,
                 value=x_col_start,
                 clearable=False
             )
@@ -307,7 +701,7 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
             html.Label("Y-Axis", style=label_style),
             dcc.Dropdown(
                 id="y-col",
-                options=[{"label": c, "value": c} for c in all_columns],
+                options=col_options,
                 value=y_col_start,
                 clearable=False
             )
@@ -316,7 +710,7 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
             html.Label("Z-Axis", style=label_style),
             dcc.Dropdown(
                 id="z-col",
-                options=[{"label": c, "value": c} for c in all_columns],
+                options=col_options,
                 value=z_col_start,
                 clearable=False
             )
@@ -324,7 +718,7 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
 
         dcc.Graph(
             id="scatter-3d",
-            figure=build_3d_figure(df, x_col_start, y_col_start, z_col_start, color_coding_start)
+            figure=_figure_json(x_col_start, y_col_start, z_col_start, color_coding_start)
         )
     ])
 
@@ -334,15 +728,19 @@ def build_dash_app(df: pd.DataFrame, x_col_start: str, y_col_start: str, z_col_s
         Input("y-col", "value"),
         Input("z-col", "value"),
         Input("color-col", "value"),
+        # the layout already holds the figure of the start columns, the hydration call on page load would only rebuild it
+        prevent_initial_call=True,
     )
     def update_figure(x_col, y_col, z_col, color_col):
-        return build_3d_figure(df, x_col, y_col, z_col, color_col)
+        return _figure_json(x_col, y_col, z_col, color_col)
     
     return app
 
-def open_browser_with_dash_app(app: Dash) -> None:
+def open_browser_with_dash_app(app: "Dash") -> None:
     """
     Open the default web browser and navigate to the local Dash app.
+    The browser is opened from a timer thread one second later, so the call returns immediately and the server is already listening when the browser connects.
     """
+    import threading
     import webbrowser
-    webbrowser.open("http://127.0.0.1:8050")
\ No newline at end of file
+    threading.Timer(1.0, webbrowser.open, args=("http://127.0.0.1:8050",)).start()
\ No newline at end of file